@@ -7,7 +7,8 @@ Principais recursos:
 - Live Preview opcional (QCheckBox) para economizar CPU quando rodando em segundo plano
 - Captura de frames em intervalos configuráveis
 - Progresso (frames gerados / previstos) e countdown no rodapé (QStatusBar)
-- Geração automática do vídeo (ffmpeg via QProcess) e abertura da pasta ao finalizar
+- Geração do vídeo durante a captura (frames crus enviados ao ffmpeg via QProcess)
+  e abertura da pasta ao finalizar
 - Bloqueio de campos Intervalo/Tempo Total durante a captura para evitar inconsistências
 
 Observação: este script espera que o arquivo "camera.ui" esteja na mesma pasta.
@@ -19,6 +20,7 @@ import time
 import math
 import platform
 import subprocess
+from functools import lru_cache
 
 # ---------------------------------------------------------
 # OpenCV costuma logar mensagens "barulhentas" em alguns PCs,
@@ -30,25 +32,115 @@ if not DEBUG:
     os.environ["OPENCV_LOG_LEVEL"] = "OFF"
 
 import cv2
+import numpy as np
+
+# Garante as variantes SIMD (SSE/AVX) e o paralelismo interno do OpenCV
+# (resize/cvtColor), deixando um núcleo livre para a UI.
+cv2.setUseOptimized(True)
+cv2.setNumThreads(max(1, (os.cpu_count() or 2) - 1))
 
 from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog
 from PyQt5 import uic
-from PyQt5.QtCore import QTimer, QProcess
+from PyQt5.QtCore import (
+    Qt, QSize, QTimer, QProcess, QThreadPool, QRunnable,
+    QThread, QMutex, QMutexLocker, QWaitCondition, QSemaphore, QElapsedTimer,
+)
 from PyQt5.QtGui import QImage, QPixmap
 
 
+# Intervalo entre atualizações do preview (~10 Hz). Visualmente equivale aos
+# 30 ms antigos, mas gasta ~3x menos CPU com conversão e upload de imagem.
+PREVIEW_INTERVALO_MS = 100
+
+# Argumentos do encoder H.264. libx264 "veryfast" é ~4x mais rápido que o
+# preset padrão (medium) com perda imperceptível num timelapse; NVENC é usado
+# quando disponível (ver TimeLapseApp._detectar_nvenc).
+ENCODER_X264_ARGS = [
+    "-c:v", "libx264", "-preset", "veryfast", "-tune", "fastdecode", "-threads", "0",
+]
+ENCODER_NVENC_ARGS = ["-c:v", "h264_nvenc", "-preset", "p1"]
+
+# QImage.Format_BGR888 só existe a partir do Qt 5.14
+HAS_FORMAT_BGR888 = hasattr(QImage, "Format_BGR888")
+
+
 # ---------------------------------------------------------
 # Utilitários (funções pequenas e independentes)
 # ---------------------------------------------------------
 def formatar_duracao(segundos: float) -> str:
     """Converte segundos em 'mm:ss' ou 'hh:mm:ss' (quando hh>0)."""
-    s = max(0, int(round(segundos)))
+    # Arredonda antes do cache: a chave é sempre um int >= 0
+    return _formatar_duracao_int(max(0, int(round(segundos))))
+
+
+@lru_cache(maxsize=4096)
+def _formatar_duracao_int(s: int) -> str:
+    """Versão com cache de formatar_duracao (recebe segundos já inteiros)."""
     hh, resto = divmod(s, 3600)
     mm, ss = divmod(resto, 60)
     if hh > 0:
         return f"{hh:02d}:{mm:02d}:{ss:02d}"
     return f"{mm:02d}:{ss:02d}"
-    
+
+
+@lru_cache(maxsize=4096)
+def formatar_mmss(segundos: int) -> str:
+    """Converte segundos (int) em 'mm:ss' (minutos podem passar de 59)."""
+    mm, ss = divmod(segundos, 60)
+    return f"{mm:02d}:{ss:02d}"
+
+
+def backend_camera() -> int:
+    """Backend de captura nativo do SO (DirectShow/V4L2/AVFoundation)."""
+    if sys.platform.startswith("win"):
+        return cv2.CAP_DSHOW
+    if sys.platform.startswith("linux"):
+        return cv2.CAP_V4L2
+    if sys.platform == "darwin":
+        return cv2.CAP_AVFOUNDATION
+    return cv2.CAP_ANY
+
+
+# O DirectShow do OpenCV usa uma única instância "videoInput" para o processo
+# inteiro, que não suporta abrir/liberar dispositivos em paralelo.
+_DSHOW_MUTEX = QMutex()
+
+
+def abrir_video_capture(index: int):
+    """Abre um cv2.VideoCapture com o backend nativo mais rápido do SO.
+
+    O backend padrão no Windows (MSMF) demora para abrir e tem latência alta;
+    DirectShow/V4L2/AVFoundation abrem rápido e respeitam CAP_PROP_BUFFERSIZE.
+    Se o backend nativo falhar, tenta o backend padrão do OpenCV.
+    Com DirectShow, a abertura é serializada por _DSHOW_MUTEX.
+    """
+    backend = backend_camera()
+    serializar = backend == cv2.CAP_DSHOW
+    if serializar:
+        _DSHOW_MUTEX.lock()
+    try:
+        cap = cv2.VideoCapture(index, backend)
+        if not cap.isOpened() and backend != cv2.CAP_ANY:
+            cap.release()
+            cap = cv2.VideoCapture(index)
+    finally:
+        if serializar:
+            _DSHOW_MUTEX.unlock()
+    return cap
+
+
+def liberar_video_capture(cap) -> None:
+    """Libera um cv2.VideoCapture (serializado por _DSHOW_MUTEX no DirectShow)."""
+    serializar = backend_camera() == cv2.CAP_DSHOW
+    if serializar:
+        _DSHOW_MUTEX.lock()
+    try:
+        cap.release()
+    finally:
+        if serializar:
+            _DSHOW_MUTEX.unlock()
+
+
 def resource_path(relative_path: str) -> str:
     """Resolve paths in dev and when bundled by PyInstaller."""
     base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
@@ -71,16 +163,170 @@ def abrir_pasta_no_sistema(pasta: str) -> None:
         pass
 
 
+class FrameWriter(QRunnable):
+    """Codifica e grava um frame JPEG fora da thread da GUI."""
+
+    def __init__(self, frame, caminho: str, params: list):
+        super().__init__()
+        self.frame = frame
+        self.caminho = caminho
+        self.params = params
+
+    def run(self):
+        ok, buf = cv2.imencode(".jpg", self.frame, self.params)
+        if not ok:
+            return
+        try:
+            with open(self.caminho, "wb") as f:
+                f.write(buf)
+        except OSError:
+            # Não é crítico: o frame só fica faltando na pasta.
+            pass
+
+
+def testar_camera(index: int) -> bool:
+    """Retorna True se a câmera abre e entrega ao menos 1 frame."""
+    cap = abrir_video_capture(index)
+    try:
+        return bool(cap.isOpened() and cap.read()[0])
+    finally:
+        liberar_video_capture(cap)
+
+
+class CameraProbe(QRunnable):
+    """Testa um índice de câmera (ver testar_camera) numa thread do pool.
+
+    O resultado vai para o dict compartilhado e o semáforo é liberado ao
+    final, mesmo em caso de erro, para quem está esperando não travar.
+    Não é usado com DirectShow (ver TimeLapseApp.detectar_cameras).
+    """
+
+    def __init__(self, index: int, resultados: dict, semaforo: QSemaphore):
+        super().__init__()
+        self.index = index
+        self.resultados = resultados
+        self.semaforo = semaforo
+
+    def run(self):
+        ok = False
+        try:
+            ok = testar_camera(self.index)
+        except Exception:
+            pass
+        finally:
+            self.resultados[self.index] = ok
+            self.semaforo.release()
+
+
+class CaptureWorker(QThread):
+    """Lê a câmera continuamente e guarda só o frame mais recente.
+
+    Mesmo com CAP_PROP_BUFFERSIZE=1, alguns backends (MJPEG/RTSP) enfileiram
+    frames internamente. Ler sem parar numa thread própria mantém essa fila
+    vazia, e os consumidores (preview/timelapse) pegam sempre o frame atual.
+
+    grab() roda sempre, mas retrieve() (que decodifica o MJPG) só roda com o
+    preview ligado (decodificar_sempre) ou quando alguém pede um frame via
+    frame_novo(). Com o preview desligado, o worker quase não gasta CPU.
+
+    Cada retrieve() aloca um array novo e o worker nunca escreve num array já
+    publicado, então os consumidores podem usar o frame sem copiar.
+    Cada frame publicado recebe um número de sequência crescente, para que o
+    timelapse não salve duas vezes o mesmo frame. Se a leitura falhar (câmera
+    desconectada, driver travado), o frame publicado volta a ser None.
+    O worker é dono do VideoCapture e o libera ao terminar.
+    """
+
+    def __init__(self, cap, frame_inicial=None, parent=None):
+        super().__init__(parent)
+        self.cap = cap
+        self.mutex = QMutex()
+        self.latest = frame_inicial
+        self.seq = 0 if frame_inicial is None else 1
+        self.cond = QWaitCondition()  # acorda quem espera em frame_novo()
+        self.decodificar_sempre = True
+        self._pedido = False
+        self._stop = False
+
+    def run(self):
+        while not self._stop:
+            if not self.cap.grab():
+                # Não deixa um frame congelado passar por atual
+                with QMutexLocker(self.mutex):
+                    self.latest = None
+                    self.cond.wakeAll()
+                self.msleep(10)
+                continue
+
+            with QMutexLocker(self.mutex):
+                decodificar = self.decodificar_sempre or self._pedido
+            if not decodificar:
+                continue
+
+            ret, frame = self.cap.retrieve()
+            with QMutexLocker(self.mutex):
+                if ret:
+                    self.latest = frame
+                    self.seq += 1
+                else:
+                    self.latest = None
+                self._pedido = False
+                self.cond.wakeAll()
+        liberar_video_capture(self.cap)
+
+    def set_decodificar_sempre(self, ligado: bool):
+        """Liga/desliga a decodificação contínua (usada pelo preview)."""
+        with QMutexLocker(self.mutex):
+            self.decodificar_sempre = bool(ligado)
+
+    def frame_novo(self, timeout_ms: int = 500):
+        """Pede a decodificação do próximo frame e espera por ele.
+
+        Retorna (seq, frame), com frame None se a leitura falhar ou expirar.
+        """
+        with QMutexLocker(self.mutex):
+            seq0 = self.seq
+            self._pedido = True
+            relogio = QElapsedTimer()
+            relogio.start()
+            while self.seq == seq0:
+                restante = timeout_ms - relogio.elapsed()
+                if restante <= 0 or not self.cond.wait(self.mutex, restante):
+                    return seq0, None
+                if self.seq == seq0 and self.latest is None:
+                    return seq0, None  # grab()/retrieve() falhou
+            return self.seq, self.latest
+
+    def frame_mais_recente(self):
+        """Retorna (seq, frame) do último frame lido (frame None se falhou)."""
+        with QMutexLocker(self.mutex):
+            return self.seq, self.latest
+
+    def parar(self, timeout_ms: int | None = None) -> bool:
+        """Sinaliza o fim do loop e aguarda a thread terminar.
+
+        Sem timeout, espera o tempo que for preciso (grab() pode bloquear
+        vários segundos num driver travado). Retorna True se a thread terminou.
+        """
+        self._stop = True
+        if timeout_ms is None:
+            return self.wait()
+        return self.wait(timeout_ms)
+
+
 class TimeLapseApp(QMainWindow):
     """Janela principal.
 
     A lógica do app foi separada em blocos:
-    - Preview (timer rápido ~30ms): lê frames continuamente e atualiza labelCamera
+    - Preview (timer single-shot ~100ms, rearmado a cada frame): atualiza labelCamera
     - Timelapse (timer lento = intervalo): salva 1 frame por intervalo
-    - UI (timer leve 250ms): atualiza rodapé com progresso/tempo restante
+    - UI (rodapé): atualizado a cada frame salvo e por um countdown de 1s que só
+      roda durante a captura (nada acorda a UI quando o app está ocioso)
 
-    Importante: quando o Live Preview está DESLIGADO, o app evita atualizar a UI
-    com frames e só lê a câmera no exato momento de salvar o frame do timelapse.
+    A câmera é lida continuamente por um CaptureWorker (QThread), que guarda só
+    o frame mais recente. Quando o Live Preview está DESLIGADO, o app não
+    atualiza a UI com frames e o worker só decodifica o frame pedido pela
+    captura no intervalo (o resto é só grab(), para drenar a fila do driver).
     """
 
     def __init__(self):
@@ -99,33 +345,57 @@ class TimeLapseApp(QMainWindow):
         # ESTADO / VARIÁVEIS DE CONTROLE
         # =============================
         self.cap = None  # cv2.VideoCapture ativo
+        self.capture_worker = None  # CaptureWorker lendo self.cap
+        self._workers_antigos = []  # workers trocados ainda presos no driver
         self.camera_index_atual = 0  # índice da webcam selecionada
-        self.frame_atual = None  # último frame capturado (numpy array)
+        self._preview_imgs = None  # double buffer [(QImage, view numpy), ...] do preview
+        self._preview_idx = 0
+        self._atualizar_tamanho_preview()
 
         # Controle do timelapse
-        self.inicio = None
-        self.fim_previsto = None
+        # Relógio monotônico (não sofre ajustes de NTP/horário de verão)
+        self.elapsed = QElapsedTimer()  # inválido até iniciar a captura
+        self._total_ms = 0  # duração total prevista da captura (ms)
         self.contador = 0
+        self._ultimo_seq_salvo = None  # seq (CaptureWorker) do último frame salvo
         self.frames_previstos = 0
+        self._dur_video_str = formatar_duracao(0)  # duração prevista (cache do rodapé)
+        self._last_rodape_sig = None  # (contador, restante) exibidos por último
         self.pasta_execucao = None  # pasta do "lote" atual
+        self._frame_prefix = None  # caminho base dos JPEGs (pasta + "frame_")
         self.video_path_ultimo = None  # mp4 gerado por último
+        self._video_shape = None  # (altura, largura) dos frames enviados ao ffmpeg
 
         # =============================
         # TIMERS
         # =============================
 
-        # Timer do preview: roda rápido, deixa a imagem fluida no QLabel.
+        # Timer do preview: single-shot, rearmado ao fim de cada atualização
+        # (evita acumular eventos se a renderização atrasar).
         self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
         self.preview_timer.timeout.connect(self.atualizar_preview)
 
         # Timer do timelapse: roda no intervalo escolhido e salva frames.
         self.capture_timer = QTimer(self)
         self.capture_timer.timeout.connect(self.capturar_frame)
 
-        # Timer "leve" de UI: atualiza rodapé (progresso/contagem regressiva).
-        self.ui_timer = QTimer(self)
-        self.ui_timer.timeout.connect(self.atualizar_rodape)
-        self.ui_timer.start(250)
+        # Pool que grava os JPEGs em background (não trava a UI durante o encode).
+        self.writer_pool = QThreadPool(self)
+        self.writer_pool.setMaxThreadCount(2)
+
+        # JPEG qualidade 85, sem otimização de Huffman nem modo progressivo:
+        # arquivos bem menores e encode mais rápido (libjpeg-turbo), sem perda
+        # visível num timelapse.
+        self._jpg_params = [
+            cv2.IMWRITE_JPEG_QUALITY, 85,
+            cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+            cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+        ]
+
+        # Countdown do rodapé: só roda durante a captura (ver iniciar_timelapse).
+        self.countdown_timer = QTimer(self)
+        self.countdown_timer.timeout.connect(self.atualizar_rodape)
 
         # =============================
         # PROCESSO FFMPEG (assíncrono)
@@ -134,6 +404,18 @@ class TimeLapseApp(QMainWindow):
         # Usamos QProcess (Qt) em vez de subprocess.Popen para saber quando termina.
         self.ffmpeg_process = QProcess(self)
         self.ffmpeg_process.finished.connect(self.video_finalizado)
+        self.ffmpeg_process.errorOccurred.connect(self._on_ffmpeg_erro)
+        self._erro_video = False  # ffmpeg falhou (não iniciou/morreu na captura)
+        # A saída do ffmpeg não é usada: manda direto para o null device em vez
+        # de acumular as linhas de progresso em buffers do Qt. Só o stdin
+        # (frames) e o exit code importam.
+        self.ffmpeg_process.setStandardOutputFile(QProcess.nullDevice())
+        self.ffmpeg_process.setStandardErrorFile(QProcess.nullDevice())
+
+        # Encoder do vídeo: libx264 rápido por padrão; troca para NVENC se o
+        # teste em background (ver _detectar_nvenc) conseguir codificar.
+        self._encoder_args = ENCODER_X264_ARGS
+        self._detectar_nvenc()
 
         # =============================
         # CONEXÕES DE UI
@@ -186,10 +468,10 @@ class TimeLapseApp(QMainWindow):
         if hasattr(self, "comboCamera"):
             self.comboCamera.setEnabled(not bloqueado)
 
-        # FPS: pode ficar editável porque só afeta a renderização do vídeo.
-        # Se preferir travar também, descomente:
-        # if hasattr(self, "spinFPS"):
-        #     self.spinFPS.setEnabled(not bloqueado)
+        # FPS: o ffmpeg já recebe o FPS ao iniciar a captura (vídeo é
+        # codificado durante o timelapse), então também trava.
+        if hasattr(self, "spinFPS"):
+            self.spinFPS.setEnabled(not bloqueado)
 
     # =====================================================
     # PREVIEW: checkbox
@@ -225,7 +507,7 @@ class TimeLapseApp(QMainWindow):
     def _aplicar_estado_preview_inicial(self):
         """Liga/desliga o preview ao iniciar o programa."""
         if self.preview_habilitado():
-            self.preview_timer.start(30)
+            self.preview_timer.start(0)
         else:
             self.preview_timer.stop()
             try:
@@ -235,8 +517,11 @@ class TimeLapseApp(QMainWindow):
 
     def _on_preview_toggled(self, checked: bool):
         """Callback do toggle da checkbox do preview."""
+        # Sem preview, o worker só decodifica frames pedidos pelo timelapse
+        if self.capture_worker:
+            self.capture_worker.set_decodificar_sempre(checked)
         if checked:
-            self.preview_timer.start(30)
+            self.preview_timer.start(0)
         else:
             self.preview_timer.stop()
             try:
@@ -247,24 +532,57 @@ class TimeLapseApp(QMainWindow):
     # =====================================================
     # CÂMERAS
     # =====================================================
-    def detectar_cameras(self, max_testes: int = 6):
-        """Detecta índices de câmera disponíveis."""
+    def detectar_cameras(self, max_testes: int = 6, timeout_ms: int = 15000):
+        """Detecta índices de câmera disponíveis.
+
+        Fora do DirectShow, cada índice é testado em paralelo numa thread do
+        pool, esperando no máximo timeout_ms (teste travado = câmera ausente).
+        O DirectShow não aceita aberturas paralelas: lá o teste é sequencial e
+        para após 2 falhas seguidas, como antes.
+        """
         self.cameras = []
-        falhas = 0
+        if backend_camera() == cv2.CAP_DSHOW:
+            self._detectar_cameras_sequencial(max_testes)
+        else:
+            self._detectar_cameras_paralelo(max_testes, timeout_ms)
+
+        if hasattr(self, "comboCamera"):
+            self.comboCamera.clear()
+            for idx in self.cameras:
+                self.comboCamera.addItem(f"Câmera {idx}", idx)
+            if self.cameras:
+                self.comboCamera.setCurrentIndex(0)
 
+    def _detectar_cameras_sequencial(self, max_testes: int):
+        """Testa os índices em ordem, parando após 2 falhas seguidas."""
+        falhas = 0
         for i in range(max_testes):
-            cap = cv2.VideoCapture(i)
-            if not cap.isOpened():
-                cap.release()
+            if testar_camera(i):
+                self.cameras.append(i)
+                falhas = 0
+            else:
                 falhas += 1
                 if falhas >= 2:
                     break
-                continue
 
-            ret, _ = cap.read()
-            cap.release()
+    def _detectar_cameras_paralelo(self, max_testes: int, timeout_ms: int):
+        """Testa todos os índices em paralelo (QThreadPool + QSemaphore)."""
+        resultados = {}
+        semaforo = QSemaphore(0)
+
+        # Pool da janela (não local): se um teste travar, a espera abaixo
+        # expira sem ficar presa no destrutor do pool.
+        self._probe_pool = QThreadPool(self)
+        self._probe_pool.setMaxThreadCount(max_testes)
+        for i in range(max_testes):
+            self._probe_pool.start(CameraProbe(i, resultados, semaforo))
+        if not semaforo.tryAcquire(max_testes, timeout_ms):
+            resultados = dict(resultados)  # ignora testes que terminarem depois
 
-            if ret:
+        # Mesmo critério da busca sequencial: para após 2 falhas seguidas
+        falhas = 0
+        for i in range(max_testes):
+            if resultados.get(i):
                 self.cameras.append(i)
                 falhas = 0
             else:
@@ -272,33 +590,63 @@ class TimeLapseApp(QMainWindow):
                 if falhas >= 2:
                     break
 
-        if hasattr(self, "comboCamera"):
-            self.comboCamera.clear()
-            for idx in self.cameras:
-                self.comboCamera.addItem(f"Câmera {idx}", idx)
-            if self.cameras:
-                self.comboCamera.setCurrentIndex(0)
-
     def abrir_camera(self, index: int) -> bool:
-        """Abre a câmera por índice (backend padrão do OpenCV)."""
-        cap = cv2.VideoCapture(index)
+        """Abre a câmera por índice (backend nativo do SO, ver abrir_video_capture).
+
+        A câmera anterior é liberada antes de abrir a nova (o backend não pode
+        ser usado por duas threads ao mesmo tempo). Se a nova falhar, fica sem
+        câmera; trocar_camera_por_combo reabre a de fallback.
+        """
+        if self.capture_worker:
+            self._descartar_worker(self.capture_worker)
+            self.capture_worker = None
+            self.cap = None
+
+        cap = abrir_video_capture(index)
         if not cap.isOpened():
-            cap.release()
+            liberar_video_capture(cap)
             return False
 
+        # MJPG: o driver entrega frames comprimidos, permitindo 30 fps em
+        # resoluções altas mesmo via USB 2 (YUY2 cai para ~5 fps em 1080p).
+        # Câmeras sem suporte simplesmente ignoram.
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+
+        # Fila do driver com 1 frame: sem isso o backend guarda ~4 frames.
+        # Se o backend recusar, o CaptureWorker drena a fila de qualquer jeito.
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
         ret, frame = cap.read()
         if not ret:
-            cap.release()
+            liberar_video_capture(cap)
             return False
 
-        if self.cap:
-            self.cap.release()
-
         self.cap = cap
         self.camera_index_atual = index
-        self.frame_atual = frame
+
+        self.capture_worker = CaptureWorker(cap, frame, self)
+        self.capture_worker.set_decodificar_sempre(self.preview_habilitado())
+        self.capture_worker.start(QThread.HighPriority)
         return True
 
+    def _descartar_worker(self, worker):
+        """Para um CaptureWorker (que libera a câmera dele ao terminar).
+
+        Se ele ainda estiver preso num grab() depois de 500 ms, fica na lista
+        _workers_antigos até terminar; closeEvent espera por todos eles.
+        """
+        if worker.parar(500):
+            worker.deleteLater()
+            return
+        self._workers_antigos.append(worker)
+        worker.finished.connect(lambda: self._worker_antigo_finalizado(worker))
+
+    def _worker_antigo_finalizado(self, worker):
+        """Remove da lista um worker antigo que enfim terminou."""
+        if worker in self._workers_antigos:
+            self._workers_antigos.remove(worker)
+            worker.deleteLater()
+
     def trocar_camera_por_combo(self):
         """Troca câmera quando usuário muda no combo (somente fora da captura)."""
         if not hasattr(self, "comboCamera"):
@@ -326,7 +674,7 @@ class TimeLapseApp(QMainWindow):
                 self.comboCamera.blockSignals(False)
 
         if preview_estava and self.preview_habilitado() and self.cap:
-            self.preview_timer.start(30)
+            self.preview_timer.start(0)
 
     # =====================================================
     # PREVIEW
@@ -338,16 +686,79 @@ class TimeLapseApp(QMainWindow):
         if not self.cap:
             return
 
-        ret, frame = self.cap.read()
-        if not ret:
-            return
-
-        self.frame_atual = frame
-
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb.shape
-        img = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888)
-        self.labelCamera.setPixmap(QPixmap.fromImage(img))
+        try:
+            _, frame = self.capture_worker.frame_mais_recente()
+            if frame is None:
+                return
+
+            # Reduz para o tamanho do QLabel antes de converter/enviar ao Qt
+            # (ex.: 1080p -> 640x480 são ~7x menos pixels). O frame em
+            # resolução cheia continua sendo o salvo pelo timelapse.
+            pw, ph = self._preview_size
+            if frame.shape[1] > pw or frame.shape[0] > ph:
+                frame = cv2.resize(frame, (pw, ph), interpolation=cv2.INTER_AREA)
+
+            if HAS_FORMAT_BGR888:
+                # Qt 5.14+: usa o layout BGR do OpenCV direto, sem cvtColor
+                formato = QImage.Format_BGR888
+            else:
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                formato = QImage.Format_RGB888
+
+            # Copia os pixels para um dos QImage pré-alocados (double buffer),
+            # em vez de criar um QImage novo por frame.
+            h, w, _ = frame.shape
+            img, pixels = self._buffer_preview(w, h, formato)
+            np.copyto(pixels, frame)
+
+            # NoFormatConversion: evita a conversão escondida para o formato da
+            # janela (ex.: ARGB32_Premultiplied no Windows) a cada frame.
+            pix = QPixmap.fromImage(img, Qt.NoFormatConversion)
+            # HiDPI: o preview já tem o tamanho em pixels físicos do QLabel
+            if self._preview_dpr != 1.0:
+                pix.setDevicePixelRatio(self._preview_dpr)
+            self.labelCamera.setPixmap(pix)
+        finally:
+            self.preview_timer.start(PREVIEW_INTERVALO_MS)
+
+    def _buffer_preview(self, w: int, h: int, formato):
+        """Retorna o próximo (QImage, view numpy) do double buffer do preview.
+
+        Os buffers são (re)alocados só quando o tamanho do preview muda. A view
+        numpy aponta direto para img.bits() e respeita o alinhamento de linha
+        (bytesPerLine) do QImage.
+        """
+        imgs = self._preview_imgs
+        if not imgs or imgs[0][0].size() != QSize(w, h) or imgs[0][0].format() != formato:
+            imgs = []
+            for _ in range(2):
+                img = QImage(w, h, formato)
+                ptr = img.bits()
+                ptr.setsize(img.sizeInBytes())
+                pixels = np.ndarray(
+                    (h, w, 3), dtype=np.uint8, buffer=ptr,
+                    strides=(img.bytesPerLine(), 3, 1),
+                )
+                imgs.append((img, pixels))
+            self._preview_imgs = imgs
+            self._preview_idx = 0
+
+        buf = imgs[self._preview_idx]
+        self._preview_idx ^= 1
+        return buf
+
+    def resizeEvent(self, event):
+        """Mantém em cache o tamanho do QLabel usado para reduzir o preview."""
+        super().resizeEvent(event)
+        self._atualizar_tamanho_preview()
+
+    def _atualizar_tamanho_preview(self):
+        """Calcula o tamanho do preview em pixels físicos (HiDPI)."""
+        self._preview_dpr = self.labelCamera.devicePixelRatioF()
+        self._preview_size = (
+            int(self.labelCamera.width() * self._preview_dpr),
+            int(self.labelCamera.height() * self._preview_dpr),
+        )
 
     # =====================================================
     # PREVISÕES
@@ -389,6 +800,16 @@ class TimeLapseApp(QMainWindow):
 
     def iniciar_timelapse(self):
         """Configura e inicia a captura de frames."""
+        # O ffmpeg ainda pode estar finalizando o vídeo anterior
+        if self.ffmpeg_process.state() != QProcess.NotRunning:
+            self.statusbar.showMessage("Aguarde a geração do vídeo anterior...")
+            return
+
+        frame = self.capture_worker.frame_mais_recente()[1] if self.capture_worker else None
+        if frame is None:
+            self.statusbar.showMessage("Nenhuma câmera disponível.")
+            return
+
         base = QFileDialog.getExistingDirectory(self, "Escolha a pasta de saída")
         if not base:
             return
@@ -396,6 +817,8 @@ class TimeLapseApp(QMainWindow):
         ts = time.strftime("timelapse_%Y%m%d_%H%M%S")
         self.pasta_execucao = os.path.join(base, ts)
         os.makedirs(self.pasta_execucao, exist_ok=True)
+        # Prefixo dos JPEGs calculado uma vez (capturar_frame só anexa o número)
+        self._frame_prefix = os.path.join(self.pasta_execucao, "frame_")
 
         intervalo = max(1, int(self.spinIntervalo.value()))
         tempo_total = max(0, int(self.spinTempoTotal.value()))
@@ -409,104 +832,192 @@ class TimeLapseApp(QMainWindow):
         self.lineEdit_2.setText(str(self.frames_previstos))
         self.lineEdit.setText("0")
 
-        self.inicio = time.time()
-        self.fim_previsto = self.inicio + tempo_total
+        self.elapsed.start()
+        self._last_rodape_sig = None
+        self._ultimo_seq_salvo = None
+        self._total_ms = tempo_total * 1000
 
         fps_video = max(1, int(self.spinFPS.value()))
-        dur_video = int(round(self.frames_previstos / fps_video)) if self.frames_previstos else 0
+        self._atualizar_cache_video(fps_video)
+
+        # O vídeo é codificado durante a captura, com a resolução da câmera
+        h, w = frame.shape[:2]
+        self.iniciar_video(w, h, fps_video)
+        if self._erro_video:
+            self.statusbar.showMessage("Erro ao iniciar o ffmpeg ❌")
+            return
 
         self.capture_timer.start(intervalo * 1000)
+        self.countdown_timer.start(1000)
         self.btnIniciarCamera.setText("Parar timelapse")
         self._bloquear_controles_captura(True)
 
         self.statusbar.showMessage(
-            f"Timelapse iniciado: {self.frames_previstos} frames | Vídeo: {formatar_duracao(dur_video)}"
+            f"Timelapse iniciado: {self.frames_previstos} frames | Vídeo: {self._dur_video_str}"
         )
 
     def capturar_frame(self):
         """Salva um frame do timelapse."""
+        # Fim do tempo primeiro: mesmo com a câmera parada (desconectada ou
+        # driver travado) o timelapse termina na hora e o MP4 é finalizado.
+        if self.elapsed.hasExpired(self._total_ms):
+            self.parar_timelapse()
+            return
+
         if not self.cap:
             return
 
-        # Se preview estiver desligado, lê a câmera só agora (economiza CPU)
+        # Com preview, o CaptureWorker já decodifica todo frame: pega o mais
+        # recente. Sem preview, pede a decodificação do próximo (espera ~1
+        # frame). Leitura com falha (None) ou frame já salvo: pula este tick.
         if self.preview_habilitado():
-            frame = self.frame_atual
+            seq, frame = self.capture_worker.frame_mais_recente()
         else:
-            ret, f = self.cap.read()
-            frame = f if ret else None
+            seq, frame = self.capture_worker.frame_novo()
 
         if frame is None or (hasattr(frame, "size") and frame.size == 0):
             return
-
-        if time.time() >= self.fim_previsto:
-            self.parar_timelapse()
+        if seq == self._ultimo_seq_salvo:
             return
 
-        nome = f"frame_{self.contador:05d}.jpg"
-        caminho = os.path.join(self.pasta_execucao, nome)
-        cv2.imwrite(caminho, frame)
+        self._ultimo_seq_salvo = seq
+        caminho = f"{self._frame_prefix}{self.contador:05d}.jpg"
+        # Sem cópia: o CaptureWorker nunca reescreve um frame já publicado
+        self.writer_pool.start(FrameWriter(frame, caminho, self._jpg_params))
+
+        # Mesmo frame, cru (bgr24), direto no stdin do ffmpeg: evita que o
+        # ffmpeg tenha que decodificar todos os JPEGs no final.
+        if (frame.shape[:2] == self._video_shape
+                and self.ffmpeg_process.state() == QProcess.Running):
+            self.ffmpeg_process.write(frame.tobytes())
 
         self.contador += 1
         self.lineEdit.setText(str(self.contador))
         self.progressBar.setValue(min(self.contador, self.progressBar.maximum()))
+        self.atualizar_rodape()
 
     def parar_timelapse(self):
-        """Para a captura e inicia a renderização do vídeo."""
+        """Para a captura e finaliza a renderização do vídeo."""
         self.capture_timer.stop()
+        self.countdown_timer.stop()
         self.btnIniciarCamera.setText("Iniciar timelapse")
         self._bloquear_controles_captura(False)
-        self.gerar_video()
+        self.finalizar_video()
 
     # =====================================================
     # STATUS / VÍDEO
     # =====================================================
     def atualizar_rodape(self):
         """Enquanto capturando, mostra progresso + countdown no rodapé."""
-        if not self.capture_timer.isActive() or not self.fim_previsto:
+        if not self.capture_timer.isActive() or not self.elapsed.isValid():
             return
 
-        restante = max(0, int(self.fim_previsto - time.time()))
-        mm, ss = divmod(restante, 60)
+        # Arredonda (não trunca): o countdown de 1s pode disparar alguns ms
+        # antes/depois da virada do segundo, o que faria pular/repetir segundos.
+        restante = max(0, int(round((self._total_ms - self.elapsed.elapsed()) / 1000.0)))
 
-        pct = int((self.contador / self.frames_previstos) * 100) if self.frames_previstos else 0
+        # Só reformata/repinta o rodapé quando algo visível mudou
+        sig = (self.contador, restante)
+        if sig == self._last_rodape_sig:
+            return
+        self._last_rodape_sig = sig
 
-        try:
-            fps_video = max(1, int(self.spinFPS.value()))
-        except Exception:
-            fps_video = 30
-        dur_video = int(round(self.frames_previstos / fps_video)) if self.frames_previstos else 0
+        pct = int((self.contador / self.frames_previstos) * 100) if self.frames_previstos else 0
 
         self.statusbar.showMessage(
             f"{self.contador}/{self.frames_previstos} frames ({pct}%)"
-            f" | Faltam {mm:02d}:{ss:02d} | Vídeo: {formatar_duracao(dur_video)}"
+            f" | Faltam {formatar_mmss(restante)} | Vídeo: {self._dur_video_str}"
         )
 
-    def gerar_video(self):
-        """Dispara o ffmpeg em background para gerar o MP4."""
-        if not self.pasta_execucao or self.contador == 0:
-            self.statusbar.showMessage("Nenhum frame para gerar vídeo.")
-            return
+    def _atualizar_cache_video(self, fps_video: int):
+        """Guarda a duração prevista do vídeo para o rodapé.
 
-        fps = max(1, int(self.spinFPS.value()))
+        O FPS fica travado durante a captura (o ffmpeg recebe o -framerate ao
+        iniciar), então o valor não muda até o fim do timelapse.
+        """
+        fps_video = max(1, int(fps_video))
+        dur_video = int(round(self.frames_previstos / fps_video)) if self.frames_previstos else 0
+        self._dur_video_str = formatar_duracao(dur_video)
+
+    def iniciar_video(self, largura: int, altura: int, fps: int):
+        """Dispara o ffmpeg em background lendo frames crus (bgr24) do stdin.
+
+        Cada frame capturado é escrito no stdin em capturar_frame; o MP4 fica
+        pronto logo depois que finalizar_video fecha o canal de escrita.
+        """
         output = os.path.join(self.pasta_execucao, "timelapse.mp4")
         self.video_path_ultimo = output
+        self._video_shape = (altura, largura)
 
         args = [
             "-y",
+            "-nostats",
+            "-loglevel", "error",
+            "-f", "rawvideo",
+            "-pix_fmt", "bgr24",
+            "-s", f"{largura}x{altura}",
             "-framerate", str(fps),
-            "-i", "frame_%05d.jpg",
-            "-c:v", "libx264",
+            "-i", "-",
+            *self._encoder_args,
             "-pix_fmt", "yuv420p",
             output,
         ]
 
+        self._erro_video = False
         self.ffmpeg_process.setWorkingDirectory(self.pasta_execucao)
         self.ffmpeg_process.start(resource_path("ffmpeg.exe"), args)
+
+    def _detectar_nvenc(self):
+        """Testa (sem travar a UI) se o ffmpeg consegue usar o h264_nvenc.
+
+        Só constar em "ffmpeg -encoders" não basta: builds comuns listam o
+        NVENC mesmo sem GPU NVIDIA. Por isso codificamos 1 frame sintético.
+        """
+        self._nvenc_probe = QProcess(self)
+        self._nvenc_probe.setStandardOutputFile(QProcess.nullDevice())
+        self._nvenc_probe.setStandardErrorFile(QProcess.nullDevice())
+        self._nvenc_probe.finished.connect(self._on_nvenc_testado)
+        self._nvenc_probe.start(resource_path("ffmpeg.exe"), [
+            "-hide_banner",
+            "-f", "lavfi", "-i", "color=size=256x256",
+            "-frames:v", "1",
+            *ENCODER_NVENC_ARGS,
+            "-f", "null", "-",
+        ])
+
+    def _on_nvenc_testado(self, exitCode, exitStatus):
+        """Callback do teste do NVENC: adota o encoder de hardware se funcionou."""
+        if exitStatus == QProcess.NormalExit and exitCode == 0:
+            self._encoder_args = ENCODER_NVENC_ARGS
+
+    def finalizar_video(self):
+        """Fecha o stdin do ffmpeg para que ele termine de gravar o MP4."""
+        if self._erro_video:
+            # O ffmpeg já morreu (ou nem iniciou): não há finished a esperar
+            self.ffmpeg_process.kill()
+            self.statusbar.showMessage("Erro ao gerar vídeo ❌ (frames JPEG salvos na pasta)")
+            return
+
+        if self.contador == 0:
+            # Sem frames: descarta o ffmpeg (video_finalizado ignora este caso)
+            self.ffmpeg_process.kill()
+            self.statusbar.showMessage("Nenhum frame para gerar vídeo.")
+            return
+
+        self.ffmpeg_process.closeWriteChannel()
         self.statusbar.showMessage("Gerando vídeo...")
 
     def video_finalizado(self, exitCode, exitStatus):
         """Callback do ffmpeg: atualiza status e abre pasta."""
-        if exitCode == 0:
+        if self.capture_timer.isActive():
+            # ffmpeg terminou no meio da captura (args, NVENC, disco cheio...)
+            self._falha_video()
+            return
+
+        if self.contador == 0 or self._erro_video:
+            return
+
+        if exitStatus == QProcess.NormalExit and exitCode == 0:
             msg = "Vídeo gerado com sucesso ✅"
             if self.video_path_ultimo:
                 msg = f"Vídeo gerado: {self.video_path_ultimo} ✅"
@@ -516,6 +1027,17 @@ class TimeLapseApp(QMainWindow):
         else:
             self.statusbar.showMessage("Erro ao gerar vídeo ❌")
 
+    def _on_ffmpeg_erro(self, erro):
+        """Callback de erro do QProcess (FailedToStart não emite finished)."""
+        if erro == QProcess.FailedToStart:
+            self._falha_video()
+
+    def _falha_video(self):
+        """Marca o vídeo como falho e encerra a captura em andamento."""
+        self._erro_video = True
+        if self.capture_timer.isActive():
+            self.parar_timelapse()
+
     def abrir_pasta_saida(self):
         """Abre a pasta da execução atual (frames + mp4)."""
         if self.pasta_execucao:
@@ -527,9 +1049,22 @@ class TimeLapseApp(QMainWindow):
     def closeEvent(self, event):
         """Libera timers e câmera ao fechar o app."""
         self.capture_timer.stop()
+        self.countdown_timer.stop()
         self.preview_timer.stop()
-        if self.cap:
-            self.cap.release()
+        self.writer_pool.waitForDone()
+        # Fechar no meio da captura: finaliza o MP4 com os frames já enviados
+        if self.ffmpeg_process.state() != QProcess.NotRunning:
+            self.ffmpeg_process.finished.disconnect(self.video_finalizado)
+            self.ffmpeg_process.closeWriteChannel()
+            self.ffmpeg_process.waitForFinished(5000)
+        if self._nvenc_probe.state() != QProcess.NotRunning:
+            self._nvenc_probe.kill()
+            self._nvenc_probe.waitForFinished(1000)
+        # Sem timeout: destruir um QThread ainda rodando aborta o processo
+        if self.capture_worker:
+            self.capture_worker.parar()
+        for worker in list(self._workers_antigos):
+            worker.wait()
         event.accept()
 
 